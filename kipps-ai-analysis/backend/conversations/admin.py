@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Count
 from .models import Conversation, Message, ConversationAnalysis
 
 
@@ -8,9 +9,15 @@ class ConversationAdmin(admin.ModelAdmin):
     list_filter = ['created_at']
     search_fields = ['title']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _message_count=Count('messages')
+        )
+    
     def message_count(self, obj):
-        return obj.messages.count()
+        return obj._message_count
     message_count.short_description = 'Messages'
+    message_count.admin_order_field = '_message_count'
 
 
 @admin.register(Message)
@@ -31,4 +38,4 @@ class ConversationAnalysisAdmin(admin.ModelAdmin):
         'resolution', 'escalation_needed', 'created_at'
     ]
     list_filter = ['sentiment', 'resolution', 'escalation_needed', 'created_at']
-    readonly_fields = ['created_at']
\ No newline at end of file
+    readonly_fields = ['created_at', 'updated_at']
\ No newline at end of file
@@ -6,13 +6,228 @@ for analyzing customer support conversations. The implementation is modular
 to allow easy replacement with more sophisticated ML models.
 """
 
+import hashlib
 import re
+import string
+from collections import deque, namedtuple
 from datetime import datetime
-from typing import List, Dict, Tuple
-from textblob import TextBlob
+from functools import lru_cache
+from typing import Any, Iterable, List, Dict, Optional, Tuple
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 
+# Compact message representation used on the analysis hot path; tokens are
+# the stored output of tokenize(text), or None to tokenize on demand
+MessageRecord = namedtuple(
+    'MessageRecord', ['sender', 'text', 'timestamp', 'tokens'], defaults=(None,)
+)
+
+# Common words ignored when measuring keyword overlap
+_STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'is', 'are', 'was', 'were', 'i', 'you', 'to', 'for'
+})
+
+# Characters that make a phrase pattern more than a literal string
+_REGEX_META = frozenset('.^$*+?{}[]\\|()')
+
+# Distinct message texts whose sentiment scores are kept in memory
+_SENTIMENT_CACHE_SIZE = 8192
+
+# Formats tried when a timestamp is not ISO 8601
+_TIMESTAMP_FORMATS = [
+    '%Y-%m-%dT%H:%M:%S.%fZ',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%d %H:%M:%S',
+]
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp_string(timestamp: str) -> Optional[datetime]:
+    """Parse a timestamp string, trying the ISO fast path first."""
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(timestamp, fmt)
+        except ValueError:
+            continue
+    
+    return None
+
+
+def _literal_trie(phrases: List[str]) -> str:
+    """Build a regex matching any of the given phrases from a prefix trie."""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase.lower():
+            node = node.setdefault(char, {})
+        node[''] = None  # End of a phrase
+    
+    def build(node):
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        optional = '' in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return '(?:{}){}'.format('|'.join(branches), '?' if optional else '')
+    
+    return build(trie)
+
+
+def _compile_union(patterns: List[str]) -> re.Pattern:
+    """
+    Combine phrase patterns into a single case-insensitive alternation.
+    
+    Plain phrases are merged into a prefix trie so phrases sharing a
+    prefix ("i understand", "i apologize", ...) are matched together
+    instead of being retried one by one at every position.
+    """
+    literals = [p for p in patterns if not _REGEX_META.intersection(p)]
+    alternatives = [f'(?:{p})' for p in patterns if _REGEX_META.intersection(p)]
+    if literals:
+        alternatives.insert(0, _literal_trie(literals))
+    return re.compile('|'.join(alternatives), re.IGNORECASE)
+
+
+def _compile_categories(
+    categories: Dict[str, List[str]]
+) -> Tuple[re.Pattern, List[Tuple[str, re.Pattern]]]:
+    """
+    Build one scanner from the literal phrases of several categories; the
+    category of each hit is reported by ``match.lastgroup``.
+    
+    The scanner counts every position where a phrase starts, which only
+    holds for literals: "understand.*frustration" would be found again
+    from each "understand" it spans. Wildcard patterns are returned
+    separately as (category, regex) pairs, one per pattern, to be counted
+    with findall() like the original per-phrase loops.
+    """
+    groups = []
+    wildcards = []
+    for name, patterns in categories.items():
+        literals = [p for p in patterns if not _REGEX_META.intersection(p)]
+        if literals:
+            groups.append(f'(?P<{name}>{_literal_trie(literals)})')
+        wildcards.extend(
+            (name, re.compile(p, re.IGNORECASE))
+            for p in patterns if _REGEX_META.intersection(p)
+        )
+    return re.compile(f'(?={"|".join(groups)})', re.IGNORECASE), wildcards
+
+
+# Fallback phrases indicating agent couldn't help
+_FALLBACK_PHRASES = [
+    r"i don't know",
+    r"can't help",
+    r"unable to assist",
+    r"sorry.*don't have",
+    r"not sure",
+    r"cannot provide",
+    r"don't have that information",
+    r"beyond my capabilities",
+]
+
+# Resolution indicators
+_RESOLUTION_PHRASES = [
+    r"resolved",
+    r"fixed",
+    r"solved",
+    r"shipped",
+    r"completed",
+    r"done",
+    r"thank you.*help",
+    r"problem.*solved",
+    r"issue.*resolved",
+    r"that works",
+    r"perfect.*thanks",
+]
+
+# Escalation keywords
+_ESCALATION_KEYWORDS = [
+    r"speak.*human",
+    r"talk.*agent",
+    r"supervisor",
+    r"manager",
+    r"escalate",
+    r"real person",
+    r"human agent",
+]
+
+# Empathy phrases
+_EMPATHY_PHRASES = [
+    r"i understand",
+    r"i apologize",
+    r"i'm sorry",
+    r"that must be",
+    r"i can imagine",
+    r"appreciate.*patience",
+    r"thank you for",
+    r"i hear you",
+    r"understand.*frustration",
+]
+
+# Hedge words lowering confidence in provided information
+_UNCERTAIN_PHRASES = [
+    r'maybe', r'perhaps', r'might be', r'could be', r'possibly',
+    r'not sure', r'i think', r'probably'
+]
+
+# Confidence indicators
+_CONFIDENT_PHRASES = [
+    r'definitely', r'certainly', r'absolutely', r'confirmed',
+    r'verified', r'guaranteed'
+]
+
+# Technical jargon that might hurt clarity
+_JARGON_TERMS = [
+    r'API', r'SDK', r'latency', r'throughput', r'deprecated',
+    r'refactor', r'endpoint', r'payload', r'middleware'
+]
+
+# One alternation per category so each message is scanned once
+_FALLBACK_RE = _compile_union(_FALLBACK_PHRASES)
+_RESOLUTION_RE = _compile_union(_RESOLUTION_PHRASES)
+_ESCALATION_RE = _compile_union(_ESCALATION_KEYWORDS)
+
+# Scanner counting every per-occurrence agent category in one pass.
+# Each category is a named group inside a lookahead, so hits never
+# consume text and one category's phrase cannot hide another's. Only
+# literal phrases go in the scanner; wildcard phrases are counted per
+# pattern, as a lookahead would count them once per starting point.
+_AGENT_SCAN_RE, _AGENT_WILDCARD_RES = _compile_categories({
+    'jargon': _JARGON_TERMS,
+    'uncertain': _UNCERTAIN_PHRASES,
+    'confident': _CONFIDENT_PHRASES,
+    'empathy': _EMPATHY_PHRASES,
+})
+
+# Question indicators
+_QUESTION_RE = re.compile(r'\?')
+
+# Lightweight tokenizers for clarity scoring
+_SENTENCE_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r'\w+')
+
+# Keyword tokenizer for relevance scoring (expects lowercased text)
+_tokenize = re.compile(r"[a-z0-9']+").findall
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split message text into the lowercase tokens used for relevance scoring.
+    
+    Messages store the result (Message.tokens) so repeated analyses of a
+    conversation do not tokenize the same text again.
+    """
+    return _tokenize(text.lower())
+
+
 class ConversationAnalyzer:
     """
     Main analyzer class that computes various metrics for conversation quality.
@@ -33,145 +248,100 @@ class ConversationAnalyzer:
     def __init__(self):
         self.vader_analyzer = SentimentIntensityAnalyzer()
         
-        # Fallback phrases indicating agent couldn't help
-        self.fallback_phrases = [
-            r"i don't know",
-            r"can't help",
-            r"unable to assist",
-            r"sorry.*don't have",
-            r"not sure",
-            r"cannot provide",
-            r"don't have that information",
-            r"beyond my capabilities",
-        ]
-        
-        # Resolution indicators
-        self.resolution_phrases = [
-            r"resolved",
-            r"fixed",
-            r"solved",
-            r"shipped",
-            r"completed",
-            r"done",
-            r"thank you.*help",
-            r"problem.*solved",
-            r"issue.*resolved",
-            r"that works",
-            r"perfect.*thanks",
-        ]
-        
-        # Escalation keywords
-        self.escalation_keywords = [
-            r"speak.*human",
-            r"talk.*agent",
-            r"supervisor",
-            r"manager",
-            r"escalate",
-            r"real person",
-            r"human agent",
-        ]
-        
-        # Empathy phrases
-        self.empathy_phrases = [
-            r"i understand",
-            r"i apologize",
-            r"i'm sorry",
-            r"that must be",
-            r"i can imagine",
-            r"appreciate.*patience",
-            r"thank you for",
-            r"i hear you",
-            r"understand.*frustration",
-        ]
-        
-        # Question indicators
-        self.question_pattern = r'\?'
-        
-        # Technical jargon that might hurt clarity
-        self.jargon_terms = [
-            r'API', r'SDK', r'latency', r'throughput', r'deprecated',
-            r'refactor', r'endpoint', r'payload', r'middleware'
-        ]
-    
-    def analyze(self, messages: List[Dict]) -> Dict:
+        # VADER only scores lexicon words and emojis; text containing
+        # neither always has a compound score of 0 and can be skipped
+        self._sentiment_words = frozenset(self.vader_analyzer.lexicon)
+        self._sentiment_emoji_re = re.compile('[{}]'.format(''.join(
+            re.escape(emoji) for emoji in self.vader_analyzer.emojis
+            if len(emoji) == 1
+        )))
+        
+        # Support transcripts repeat many short messages ("Thanks!", "Any
+        # update?", canned agent replies), so compound scores are memoized
+        # per text across every conversation this analyzer sees
+        self._message_compound = lru_cache(maxsize=_SENTIMENT_CACHE_SIZE)(
+            self._score_message
+        )
+    
+    def analyze(self, messages: Iterable[Any]) -> Dict:
         """
         Main analysis method that computes all metrics.
         
         Args:
-            messages: List of message dicts with 'sender', 'text', 'timestamp'
+            messages: Message dicts with 'sender', 'text', 'timestamp' keys,
+                or (sender, text, timestamp) tuples such as the rows of
+                ``values_list('sender', 'text', 'timestamp')``; an optional
+                fourth 'tokens' entry holds pre-computed tokenize() output
         
         Returns:
             Dictionary with all computed metrics
         """
-        agent_messages = [m for m in messages if m['sender'] == 'agent']
-        user_messages = [m for m in messages if m['sender'] == 'user']
-        
-        if not agent_messages or not user_messages:
-            return self._default_scores()
-        
-        # Compute individual metrics
-        clarity_score = self._compute_clarity_score(agent_messages)
-        relevance_score = self._compute_relevance_score(user_messages, agent_messages)
-        accuracy_score = self._compute_accuracy_score(agent_messages)
-        completeness_score = self._compute_completeness_score(user_messages, agent_messages)
-        empathy_score = self._compute_empathy_score(agent_messages)
-        fallback_count = self._count_fallbacks(agent_messages)
-        sentiment = self._analyze_sentiment(messages)
-        resolution = self._detect_resolution(messages)
-        escalation_needed = self._detect_escalation_need(
-            messages, sentiment, fallback_count
-        )
-        avg_response_time = self._compute_avg_response_time(messages)
+        stream = self.stream()
+        stream.feed(messages)
+        return stream.finalize()
+    
+    def stream(self) -> 'AnalysisStream':
+        """
+        Start an incremental analysis of one conversation.
         
-        # Compute overall score (weighted average)
-        overall_score = self._compute_overall_score(
-            clarity_score, relevance_score, accuracy_score,
-            completeness_score, empathy_score, resolution
-        )
+        Feed the messages in timestamp order, in chunks of any size, then
+        call finalize() for the metrics analyze() would return. Only running
+        counters are kept between chunks, so memory use is bounded by the
+        chunk size rather than the length of the conversation.
+        """
+        return AnalysisStream(self)
+    
+    @staticmethod
+    def _to_record(message) -> MessageRecord:
+        """Convert a message dict or tuple into a MessageRecord."""
+        if isinstance(message, dict):
+            return MessageRecord(
+                message['sender'], message['text'], message['timestamp'],
+                message.get('tokens')
+            )
+        return MessageRecord(*message)
+    
+    def _scan_agent_messages(self, agent_messages: List[MessageRecord],
+                             counts: Dict[str, int]) -> None:
+        """
+        Walk the agent messages once and add every counter needed by the
+        clarity, accuracy, empathy and fallback metrics to ``counts``.
+        """
+        counts['messages'] += len(agent_messages)
         
-        return {
-            'clarity_score': round(clarity_score, 2),
-            'relevance_score': round(relevance_score, 2),
-            'accuracy_score': round(accuracy_score, 2),
-            'completeness_score': round(completeness_score, 2),
-            'empathy_score': round(empathy_score, 2),
-            'fallback_count': fallback_count,
-            'sentiment': sentiment,
-            'resolution': resolution,
-            'escalation_needed': escalation_needed,
-            'avg_response_time_seconds': round(avg_response_time, 2),
-            'overall_score': round(overall_score, 2),
-        }
+        for msg in agent_messages:
+            text = msg.text
+            
+            # Count sentences and words (unterminated text is one sentence)
+            counts['sentences'] += len(_SENTENCE_RE.findall(text)) or 1
+            counts['words'] += len(_WORD_RE.findall(text))
+            
+            # Jargon, hedge, confidence and empathy hits in one scan
+            for match in _AGENT_SCAN_RE.finditer(text):
+                counts[match.lastgroup] += 1
+            for name, regex in _AGENT_WILDCARD_RES:
+                counts[name] += len(regex.findall(text))
+            
+            # Count each fallback message only once. Kept as its own search:
+            # 'not sure' is both a fallback and a hedge phrase, and a shared
+            # scanner can only attribute a position to one category.
+            if _FALLBACK_RE.search(text):
+                counts['fallbacks'] += 1
     
-    def _compute_clarity_score(self, agent_messages: List[Dict]) -> float:
+    def _compute_clarity_score(self, counts: Dict[str, int]) -> float:
         """
         Compute clarity score based on:
         - Average sentence length (shorter is clearer)
         - Use of jargon (less is clearer)
-        - Readability (using TextBlob)
+        - Readability (sentence and word counts)
         """
-        if not agent_messages:
+        if not counts['sentences']:
             return 0.0
         
-        total_words = 0
-        total_sentences = 0
-        jargon_count = 0
-        
-        for msg in agent_messages:
-            text = msg['text']
-            blob = TextBlob(text)
-            
-            # Count sentences and words
-            sentences = blob.sentences
-            total_sentences += len(sentences)
-            total_words += len(blob.words)
-            
-            # Count jargon
-            for term in self.jargon_terms:
-                jargon_count += len(re.findall(term, text, re.IGNORECASE))
+        jargon_count = counts['jargon']
         
         # Average words per sentence (ideal: 15-20 words)
-        avg_words_per_sentence = total_words / max(total_sentences, 1)
+        avg_words_per_sentence = counts['words'] / counts['sentences']
         sentence_score = 100 - abs(avg_words_per_sentence - 17.5) * 2
         sentence_score = max(0, min(100, sentence_score))
         
@@ -183,74 +353,25 @@ class ConversationAnalyzer:
         
         return clarity_score
     
-    def _compute_relevance_score(self, user_messages: List[Dict],
-                                  agent_messages: List[Dict]) -> float:
-        """
-        Compute relevance by checking if agent responses address user questions
-        and maintain topic continuity.
-        """
-        if not user_messages or not agent_messages:
-            return 0.0
-        
-        relevance_scores = []
-        
-        for i, user_msg in enumerate(user_messages):
-            # Find the next agent message
-            agent_response = None
-            for agent_msg in agent_messages:
-                if agent_msg['timestamp'] > user_msg['timestamp']:
-                    agent_response = agent_msg
-                    break
-            
-            if not agent_response:
-                continue
-            
-            # Simple keyword overlap as relevance proxy
-            user_words = set(user_msg['text'].lower().split())
-            agent_words = set(agent_response['text'].lower().split())
-            
-            # Remove common stop words
-            stop_words = {'a', 'an', 'the', 'is', 'are', 'was', 'were', 'i', 'you', 'to', 'for'}
-            user_words -= stop_words
-            agent_words -= stop_words
-            
-            if user_words:
-                overlap = len(user_words & agent_words) / len(user_words)
-                relevance_scores.append(overlap * 100)
-        
-        return sum(relevance_scores) / len(relevance_scores) if relevance_scores else 50.0
+    def _keywords(self, message: MessageRecord) -> set:
+        """Lowercased tokens of a message, minus stop words."""
+        tokens = message.tokens
+        if tokens is None:
+            tokens = tokenize(message.text)
+        return set(tokens) - _STOP_WORDS
     
-    def _compute_accuracy_score(self, agent_messages: List[Dict]) -> float:
+    def _compute_accuracy_score(self, counts: Dict[str, int]) -> float:
         """
         Compute accuracy score based on:
         - Presence of uncertain language
         - Confidence indicators
         - Hedge words
         """
-        if not agent_messages:
+        if not counts['messages']:
             return 0.0
         
-        uncertain_phrases = [
-            r'maybe', r'perhaps', r'might be', r'could be', r'possibly',
-            r'not sure', r'i think', r'probably'
-        ]
-        
-        confident_phrases = [
-            r'definitely', r'certainly', r'absolutely', r'confirmed',
-            r'verified', r'guaranteed'
-        ]
-        
-        uncertain_count = 0
-        confident_count = 0
-        
-        for msg in agent_messages:
-            text = msg['text'].lower()
-            
-            for phrase in uncertain_phrases:
-                uncertain_count += len(re.findall(phrase, text))
-            
-            for phrase in confident_phrases:
-                confident_count += len(re.findall(phrase, text))
+        uncertain_count = counts['uncertain']
+        confident_count = counts['confident']
         
         # Start with base score and adjust
         base_score = 75.0
@@ -258,22 +379,19 @@ class ConversationAnalyzer:
         
         return max(0, min(100, accuracy_score))
     
-    def _compute_completeness_score(self, user_messages: List[Dict],
-                                     agent_messages: List[Dict]) -> float:
+    def _compute_completeness_score(self, user_count: int, user_questions: int,
+                                     agent_count: int) -> float:
         """
         Compute completeness by checking if all user questions were addressed.
         """
-        if not user_messages:
+        if not user_count:
             return 100.0
         
-        user_questions = sum(1 for msg in user_messages 
-                           if re.search(self.question_pattern, msg['text']))
-        
         if user_questions == 0:
             return 80.0  # No questions, assume mostly complete
         
         # Check if agent provided multiple responses (likely addressing questions)
-        response_ratio = len(agent_messages) / max(user_questions, 1)
+        response_ratio = agent_count / max(user_questions, 1)
         
         # Score based on response ratio
         if response_ratio >= 1.0:
@@ -283,55 +401,51 @@ class ConversationAnalyzer:
         
         return completeness_score
     
-    def _compute_empathy_score(self, agent_messages: List[Dict]) -> float:
+    def _count_questions(self, user_messages: List[MessageRecord]) -> int:
+        """Count the user messages asking a question."""
+        return sum(1 for msg in user_messages if _QUESTION_RE.search(msg.text))
+    
+    def _compute_empathy_score(self, counts: Dict[str, int]) -> float:
         """
         Compute empathy score based on presence of empathetic language.
         """
-        if not agent_messages:
+        if not counts['messages']:
             return 0.0
         
-        empathy_count = 0
-        
-        for msg in agent_messages:
-            text = msg['text'].lower()
-            
-            for phrase in self.empathy_phrases:
-                empathy_count += len(re.findall(phrase, text))
-        
         # Score based on empathy phrases per message
-        empathy_per_message = empathy_count / len(agent_messages)
+        empathy_per_message = counts['empathy'] / counts['messages']
         empathy_score = min(100, empathy_per_message * 50 + 30)
         
         return empathy_score
     
-    def _count_fallbacks(self, agent_messages: List[Dict]) -> int:
-        """Count the number of fallback responses."""
-        fallback_count = 0
-        
-        for msg in agent_messages:
-            text = msg['text'].lower()
-            
-            for phrase in self.fallback_phrases:
-                if re.search(phrase, text):
-                    fallback_count += 1
-                    break  # Count each message only once
-        
-        return fallback_count
-    
-    def _analyze_sentiment(self, messages: List[Dict]) -> str:
+    def _sentiment_totals(self, messages: List[MessageRecord]) -> Tuple[float, int]:
         """
-        Analyze overall conversation sentiment using VADER.
-        """
-        if not messages:
-            return 'neutral'
+        Score messages with VADER, returning the sum of their compound scores
+        weighted by message length and the total length.
         
-        # Combine all messages
-        full_text = ' '.join(msg['text'] for msg in messages)
+        Each message is scored on its own so the transcript is never copied
+        into one large string; the weighted average is taken by the caller.
+        """
+        weighted_compound = 0.0
+        total_length = 0
         
-        # Use VADER for sentiment analysis
-        scores = self.vader_analyzer.polarity_scores(full_text)
-        compound = scores['compound']
+        for msg in messages:
+            text = msg.text
+            if not text:
+                continue
+            weighted_compound += self._message_compound(text) * len(text)
+            total_length += len(text)
         
+        return weighted_compound, total_length
+    
+    def _score_message(self, text: str) -> float:
+        """VADER compound score of one message (0 when it has no cues)."""
+        if not self._has_sentiment_cues(text):
+            return 0.0
+        return self.vader_analyzer.polarity_scores(text)['compound']
+    
+    def _sentiment_label(self, compound: float) -> str:
+        """Map an averaged VADER compound score to a sentiment label."""
         if compound >= 0.05:
             return 'positive'
         elif compound <= -0.05:
@@ -339,37 +453,50 @@ class ConversationAnalyzer:
         else:
             return 'neutral'
     
-    def _detect_resolution(self, messages: List[Dict]) -> bool:
+    def _has_sentiment_cues(self, text: str) -> bool:
         """
-        Detect if the conversation was resolved based on resolution phrases.
+        Check whether VADER could score the text as non-neutral, tokenizing
+        the same way VADER does (whitespace split, punctuation stripped unless
+        that leaves an emoticon).
         """
-        # Check last few messages for resolution indicators
-        recent_messages = messages[-3:] if len(messages) >= 3 else messages
+        if self._sentiment_emoji_re.search(text):
+            return True
         
-        for msg in recent_messages:
-            text = msg['text'].lower()
-            
-            for phrase in self.resolution_phrases:
-                if re.search(phrase, text):
-                    return True
+        for token in text.lower().split():
+            stripped = token.strip(string.punctuation)
+            if (stripped if len(stripped) > 2 else token) in self._sentiment_words:
+                return True
+        
+        return False
+    
+    def _detect_resolution(self, messages: List[MessageRecord]) -> bool:
+        """
+        Detect if the conversation was resolved based on resolution phrases.
+        """
+        # Check last few messages for resolution indicators, newest first
+        last = len(messages) - 1
+        for i in range(last, max(last - 3, -1), -1):
+            if _RESOLUTION_RE.search(messages[i].text):
+                return True
         
         return False
     
-    def _detect_escalation_need(self, messages: List[Dict],
+    def _requests_escalation(self, user_messages: List[MessageRecord]) -> bool:
+        """Check whether the user explicitly asked for a human agent."""
+        # One search over all user text; '.' never crosses the newline
+        # separators, so a phrase still has to occur within a single message
+        user_text = '\n'.join(msg.text for msg in user_messages)
+        return bool(_ESCALATION_RE.search(user_text))
+    
+    def _detect_escalation_need(self, escalation_requested: bool,
                                 sentiment: str, fallback_count: int) -> bool:
         """
         Detect if conversation needs escalation based on:
         - Negative sentiment + fallbacks
         - User explicitly asking for human agent
         """
-        # Check for explicit escalation requests
-        for msg in messages:
-            if msg['sender'] == 'user':
-                text = msg['text'].lower()
-                
-                for keyword in self.escalation_keywords:
-                    if re.search(keyword, text):
-                        return True
+        if escalation_requested:
+            return True
         
         # Check for negative sentiment with fallbacks
         if sentiment == 'negative' and fallback_count > 0:
@@ -381,45 +508,35 @@ class ConversationAnalyzer:
         
         return False
     
-    def _compute_avg_response_time(self, messages: List[Dict]) -> float:
+    def _response_time_totals(self, messages: List[MessageRecord]) -> Tuple[float, int]:
         """
-        Compute average agent response time in seconds.
+        Sum the agent response times (in seconds) between consecutive
+        user -> agent messages, returning the total and the number of
+        responses.
         """
         response_times = []
         
         for i in range(len(messages) - 1):
-            if messages[i]['sender'] == 'user' and messages[i + 1]['sender'] == 'agent':
-                try:
-                    user_time = self._parse_timestamp(messages[i]['timestamp'])
-                    agent_time = self._parse_timestamp(messages[i + 1]['timestamp'])
-                    
-                    if user_time and agent_time:
+            if messages[i].sender == 'user' and messages[i + 1].sender == 'agent':
+                user_time = self._parse_timestamp(messages[i].timestamp)
+                agent_time = self._parse_timestamp(messages[i + 1].timestamp)
+                
+                if user_time and agent_time:
+                    try:
                         response_time = (agent_time - user_time).total_seconds()
-                        if response_time > 0:  # Ignore negative times (data issues)
-                            response_times.append(response_time)
-                except:
-                    continue
+                    except TypeError:
+                        continue  # Naive and aware timestamps mixed
+                    if response_time > 0:  # Ignore negative times (data issues)
+                        response_times.append(response_time)
         
-        return sum(response_times) / len(response_times) if response_times else 0.0
+        return sum(response_times), len(response_times)
     
-    def _parse_timestamp(self, timestamp) -> datetime:
+    def _parse_timestamp(self, timestamp) -> Optional[datetime]:
         """Parse timestamp string or datetime object."""
         if isinstance(timestamp, datetime):
             return timestamp
-        
-        # Try different formats
-        formats = [
-            '%Y-%m-%dT%H:%M:%S.%fZ',
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%d %H:%M:%S',
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(timestamp, fmt)
-            except:
-                continue
-        
+        if isinstance(timestamp, str):
+            return _parse_timestamp_string(timestamp)
         return None
     
     def _compute_overall_score(self, clarity: float, relevance: float,
@@ -464,4 +581,213 @@ class ConversationAnalyzer:
             'escalation_needed': False,
             'avg_response_time_seconds': 0.0,
             'overall_score': 0.0,
-        }
\ No newline at end of file
+        }
+
+
+class AnalysisStream:
+    """
+    Running analysis of one conversation, created by
+    ConversationAnalyzer.stream().
+    
+    Holds the counters for every metric plus the few messages later chunks
+    still depend on: user messages awaiting an agent reply, the previous
+    message (for response times) and the last three (for resolution).
+    """
+    
+    def __init__(self, analyzer: ConversationAnalyzer):
+        self._analyzer = analyzer
+        self.message_count = 0
+        self._user_count = 0
+        self._user_questions = 0
+        self._agent_counts = {
+            'messages': 0,
+            'sentences': 0,
+            'words': 0,
+            'jargon': 0,
+            'uncertain': 0,
+            'confident': 0,
+            'empathy': 0,
+            'fallbacks': 0,
+        }
+        # (timestamp, keywords) of user messages not yet followed by a reply
+        self._pending_users = []
+        self._relevance_total = 0.0
+        self._relevance_count = 0
+        self._sentiment_weighted = 0.0
+        self._sentiment_length = 0
+        self._escalation_requested = False
+        self._response_time_total = 0.0
+        self._response_time_count = 0
+        self._previous = None
+        self._recent = deque(maxlen=3)
+    
+    def feed(self, messages: Iterable[Any]) -> None:
+        """
+        Add the next chunk of messages (dicts or tuples, as for analyze()).
+        """
+        analyzer = self._analyzer
+        
+        # Normalize to records and split by sender in a single pass
+        messages = [analyzer._to_record(m) for m in messages]
+        if not messages:
+            return
+        agent_messages = []
+        user_messages = []
+        for m in messages:
+            sender = m.sender
+            if sender == 'agent':
+                agent_messages.append(m)
+            elif sender == 'user':
+                user_messages.append(m)
+        
+        self.message_count += len(messages)
+        self._user_count += len(user_messages)
+        
+        analyzer._scan_agent_messages(agent_messages, self._agent_counts)
+        self._user_questions += analyzer._count_questions(user_messages)
+        self._score_relevance(messages)
+        
+        weighted, length = analyzer._sentiment_totals(messages)
+        self._sentiment_weighted += weighted
+        self._sentiment_length += length
+        
+        if not self._escalation_requested:
+            self._escalation_requested = analyzer._requests_escalation(user_messages)
+        
+        # Pair the last message of the previous chunk with this chunk's first
+        previous = self._previous
+        self._previous = messages[-1]
+        self._recent.extend(messages[-3:])
+        if previous is not None:
+            messages.insert(0, previous)
+        total, count = analyzer._response_time_totals(messages)
+        self._response_time_total += total
+        self._response_time_count += count
+    
+    def _score_relevance(self, messages: List[MessageRecord]) -> None:
+        """
+        Score each user message against the first agent reply with a later
+        timestamp (messages are expected in timestamp order), using keyword
+        overlap as a relevance proxy.
+        """
+        analyzer = self._analyzer
+        pending = self._pending_users
+        
+        for msg in messages:
+            if msg.sender == 'user':
+                # Messages without keywords cannot be scored
+                user_words = analyzer._keywords(msg)
+                if user_words:
+                    pending.append((msg.timestamp, user_words))
+            elif msg.sender == 'agent' and pending:
+                # The reply is tokenized once for all users it answers
+                agent_words = None
+                waiting = []
+                for timestamp, user_words in pending:
+                    if not timestamp < msg.timestamp:
+                        waiting.append((timestamp, user_words))
+                        continue
+                    if agent_words is None:
+                        agent_words = analyzer._keywords(msg)
+                    overlap = len(user_words & agent_words) / len(user_words)
+                    self._relevance_total += overlap * 100
+                    self._relevance_count += 1
+                pending[:] = waiting
+    
+    def finalize(self) -> Dict:
+        """Compute the metrics for every message fed so far."""
+        analyzer = self._analyzer
+        counts = self._agent_counts
+        
+        if not counts['messages'] or not self._user_count:
+            return analyzer._default_scores()
+        
+        # Compute individual metrics
+        clarity_score = analyzer._compute_clarity_score(counts)
+        relevance_score = (
+            self._relevance_total / self._relevance_count
+            if self._relevance_count else 50.0
+        )
+        accuracy_score = analyzer._compute_accuracy_score(counts)
+        completeness_score = analyzer._compute_completeness_score(
+            self._user_count, self._user_questions, counts['messages']
+        )
+        empathy_score = analyzer._compute_empathy_score(counts)
+        fallback_count = counts['fallbacks']
+        sentiment = analyzer._sentiment_label(
+            self._sentiment_weighted / self._sentiment_length
+            if self._sentiment_length else 0.0
+        )
+        resolution = analyzer._detect_resolution(list(self._recent))
+        escalation_needed = analyzer._detect_escalation_need(
+            self._escalation_requested, sentiment, fallback_count
+        )
+        avg_response_time = (
+            self._response_time_total / self._response_time_count
+            if self._response_time_count else 0.0
+        )
+        
+        # Compute overall score (weighted average)
+        overall_score = analyzer._compute_overall_score(
+            clarity_score, relevance_score, accuracy_score,
+            completeness_score, empathy_score, resolution
+        )
+        
+        return {
+            'clarity_score': round(clarity_score, 2),
+            'relevance_score': round(relevance_score, 2),
+            'accuracy_score': round(accuracy_score, 2),
+            'completeness_score': round(completeness_score, 2),
+            'empathy_score': round(empathy_score, 2),
+            'fallback_count': fallback_count,
+            'sentiment': sentiment,
+            'resolution': resolution,
+            'escalation_needed': escalation_needed,
+            'avg_response_time_seconds': round(avg_response_time, 2),
+            'overall_score': round(overall_score, 2),
+        }
+
+
+class ContentHasher:
+    """Incremental form of content_hash, for messages read in chunks."""
+    
+    def __init__(self):
+        self._digest = hashlib.blake2b(digest_size=16)
+    
+    def update(self, messages: Iterable[Any]) -> None:
+        """Add the next messages, in conversation order."""
+        for message in messages:
+            # Stored tokens are derived from the text and are not hashed
+            sender, text, timestamp, _ = ConversationAnalyzer._to_record(message)
+            self._digest.update(repr((sender, text, timestamp)).encode())
+    
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def content_hash(messages: Iterable[Any]) -> str:
+    """
+    Hash the ordered (sender, text, timestamp) contents of a conversation,
+    so an analysis can be reused while its messages are unchanged.
+    """
+    hasher = ContentHasher()
+    hasher.update(messages)
+    return hasher.hexdigest()
+
+
+# Analyzer shared by every request and task in a process (built on first use)
+_ANALYZER = None
+
+
+def get_analyzer() -> ConversationAnalyzer:
+    """
+    Return the process-wide ConversationAnalyzer, constructing it lazily.
+    
+    The analyzer keeps no per-conversation state once constructed, so a
+    single instance is safe to share between threads and the VADER lexicon
+    and regexes are only loaded once.
+    """
+    global _ANALYZER
+    if _ANALYZER is None:
+        _ANALYZER = ConversationAnalyzer()
+    return _ANALYZER
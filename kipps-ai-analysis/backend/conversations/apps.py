@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class ConversationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'conversations'
\ No newline at end of file
+    name = 'conversations'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,14 @@
+from django_filters import rest_framework as filters
+from .models import ConversationAnalysis
+
+
+class AnalysisFilter(filters.FilterSet):
+    """Query parameters accepted by GET /api/analysis/"""
+    sentiment = filters.ChoiceFilter(choices=ConversationAnalysis.SENTIMENT_CHOICES)
+    min_score = filters.NumberFilter(field_name='overall_score', lookup_expr='gte')
+    date_from = filters.DateTimeFilter(field_name='created_at', lookup_expr='gte')
+    date_to = filters.DateTimeFilter(field_name='created_at', lookup_expr='lte')
+
+    class Meta:
+        model = ConversationAnalysis
+        fields = ['sentiment', 'min_score', 'date_from', 'date_to']
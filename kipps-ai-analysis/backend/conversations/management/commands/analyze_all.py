@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+# Models are imported lazily: under the 'spawn' start method, worker
+# processes import this module before Django has been set up
+
+
+def _init_worker():
+    """Set up Django in worker processes started with the 'spawn' method."""
+    django.setup()
+
+
+def _analyze(conversation_id):
+    """Worker entry point: analyze one conversation and return its status."""
+    from conversations.tasks import analyze_conversation_task
+    return analyze_conversation_task(conversation_id)
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-analyze every conversation (e.g. after the analysis rules change), '
+        'spreading the work over several processes.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Number of worker processes (default: one per CPU core)'
+        )
+        parser.add_argument(
+            '--chunksize', type=int, default=16,
+            help='Conversations handed to a worker at a time'
+        )
+    
+    def handle(self, *args, **options):
+        from conversations.models import Conversation
+        
+        ids = list(Conversation.objects.order_by('id').values_list('id', flat=True))
+        workers = max(1, options['workers'])
+        
+        if workers == 1:
+            results = map(_analyze, ids)
+            self._report(results)
+            return
+        
+        # Forked workers must not share the parent's database connections;
+        # each opens its own on first use
+        connections.close_all()
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            results = executor.map(
+                _analyze, ids, chunksize=options['chunksize']
+            )
+            self._report(results)
+    
+    def _report(self, results):
+        """Print failures as they arrive, then a summary."""
+        analyzed = failed = 0
+        for result in results:
+            if result.startswith('Analysis'):
+                analyzed += 1
+            else:
+                failed += 1
+                self.stderr.write(result)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Analyzed {analyzed} conversations ({failed} skipped or failed)'
+        ))
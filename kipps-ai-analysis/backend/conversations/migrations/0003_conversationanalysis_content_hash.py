@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0002_message_conversatio_convers_70c0ca_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversationanalysis',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0003_conversationanalysis_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conversationanalysis',
+            index=models.Index(fields=['sentiment', 'created_at'], name='conversatio_sentime_a8b811_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conversationanalysis',
+            index=models.Index(fields=['overall_score'], name='conversatio_overall_c44dcf_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0004_conversationanalysis_conversatio_sentime_a8b811_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='tokens',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -29,12 +29,24 @@ class Message(models.Model):
     sender = models.CharField(max_length=10, choices=SENDER_CHOICES)
     text = models.TextField()
     timestamp = models.DateTimeField()
+    # Relevance-scoring tokens of the text, filled in on save
+    tokens = models.JSONField(null=True, blank=True, editable=False)
     
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            models.Index(fields=['conversation', 'timestamp']),
+        ]
     
     def __str__(self):
         return f"{self.sender}: {self.text[:50]}"
+    
+    def save(self, *args, update_fields=None, **kwargs):
+        # The pre_save hook re-tokenizes changed text, so the tokens must be
+        # written whenever the text is
+        if update_fields is not None and 'text' in update_fields:
+            update_fields = {*update_fields, 'tokens'}
+        super().save(*args, update_fields=update_fields, **kwargs)
 
 
 class ConversationAnalysis(models.Model):
@@ -70,11 +82,19 @@ class ConversationAnalysis(models.Model):
     avg_response_time_seconds = models.FloatField(default=0.0)
     overall_score = models.FloatField(default=0.0)
     
+    # Hash of the messages the analysis was computed from
+    content_hash = models.CharField(max_length=32, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Conversation Analyses'
+        indexes = [
+            models.Index(fields=['sentiment', 'created_at']),
+            models.Index(fields=['overall_score']),
+        ]
     
     def __str__(self):
         return f"Analysis for Conversation {self.conversation.id}"
\ No newline at end of file
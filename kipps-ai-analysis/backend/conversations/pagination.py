@@ -0,0 +1,7 @@
+from rest_framework.pagination import CursorPagination
+
+
+class AnalysisCursorPagination(CursorPagination):
+    """Keyset pagination over analyses, newest first"""
+    ordering = '-created_at'
+    page_size = 50
@@ -0,0 +1,58 @@
+"""
+orjson-backed JSON renderer and parser.
+
+Drop-in replacements for DRF's JSONRenderer and JSONParser that serialize
+and parse several times faster than the stdlib json module.
+"""
+
+from decimal import Decimal
+
+import orjson
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+
+
+def _default(obj):
+    """Serialize the types orjson does not handle natively."""
+    if isinstance(obj, Promise):
+        return force_str(obj)  # Lazy translation strings
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()  # NumPy scalars orjson does not cover
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Render data as JSON with orjson."""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+    
+    options = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        options = self.options
+        # The browsable API asks for indented output
+        if (renderer_context or {}).get('indent'):
+            options |= orjson.OPT_INDENT_2
+        
+        return orjson.dumps(data, default=_default, option=options)
+
+
+class ORJSONParser(BaseParser):
+    """Parse JSON request bodies with orjson."""
+    media_type = 'application/json'
+    renderer_class = ORJSONRenderer
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -1,5 +1,7 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import Conversation, Message, ConversationAnalysis
+from .analysis import tokenize
 
 
 class MessageSerializer(serializers.ModelSerializer):
@@ -20,9 +22,10 @@ class ConversationAnalysisSerializer(serializers.ModelSerializer):
             'id', 'conversation', 'clarity_score', 'relevance_score',
             'accuracy_score', 'completeness_score', 'empathy_score',
             'fallback_count', 'sentiment', 'resolution', 'escalation_needed',
-            'avg_response_time_seconds', 'overall_score', 'created_at'
+            'avg_response_time_seconds', 'overall_score', 'created_at',
+            'updated_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
 
 
 class ConversationSerializer(serializers.ModelSerializer):
@@ -41,6 +44,14 @@ class ConversationSerializer(serializers.ModelSerializer):
         return hasattr(obj, 'analysis')
 
 
+class ConversationListSerializer(ConversationSerializer):
+    """Conversation summary for list views: a message count instead of messages"""
+    message_count = serializers.IntegerField(read_only=True)
+    
+    class Meta(ConversationSerializer.Meta):
+        fields = ['id', 'title', 'created_at', 'message_count', 'analysis', 'has_analysis']
+
+
 class ConversationCreateSerializer(serializers.Serializer):
     """Serializer for creating conversations with messages from JSON"""
     title = serializers.CharField(max_length=255, required=False, allow_blank=True)
@@ -67,16 +78,24 @@ class ConversationCreateSerializer(serializers.Serializer):
         messages_data = validated_data.pop('messages')
         title = validated_data.get('title', '')
         
-        # Create conversation
-        conversation = Conversation.objects.create(title=title)
-        
-        # Create messages
-        for msg_data in messages_data:
-            Message.objects.create(
-                conversation=conversation,
-                sender=msg_data['sender'],
-                text=msg_data['text'],
-                timestamp=msg_data['timestamp']
+        with transaction.atomic():
+            # Create conversation
+            conversation = Conversation.objects.create(title=title)
+            
+            # Create messages in batched INSERTs (bulk_create skips the
+            # pre_save signal, so tokens are filled in here)
+            Message.objects.bulk_create(
+                [
+                    Message(
+                        conversation=conversation,
+                        sender=msg_data['sender'],
+                        text=msg_data['text'],
+                        timestamp=msg_data['timestamp'],
+                        tokens=tokenize(msg_data['text'])
+                    )
+                    for msg_data in messages_data
+                ],
+                batch_size=1000
             )
         
         return conversation
\ No newline at end of file
@@ -0,0 +1,13 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .analysis import tokenize
+from .models import Message
+
+
+@receiver(pre_save, sender=Message)
+def tokenize_message(sender, instance, update_fields=None, **kwargs):
+    """Store the message's tokens so analyses do not re-tokenize its text."""
+    if update_fields is not None and 'text' not in update_fields:
+        return
+    instance.tokens = tokenize(instance.text)
@@ -1,7 +1,64 @@
-from celery import shared_task
-from django.db.models import Q
-from .models import Conversation, ConversationAnalysis
-from .analysis import ConversationAnalyzer
+from itertools import islice
+
+from celery import group, shared_task
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import Conversation, Message, ConversationAnalysis
+from .analysis import ContentHasher, get_analyzer
+
+
+# Number of conversation ids read and queued for analysis at a time
+ANALYSIS_BATCH_SIZE = 100
+
+# Seconds an analysis result stays cached under its content hash
+ANALYSIS_CACHE_TIMEOUT = 3600
+
+# Messages read from the database and fed to the analyzer at a time
+MESSAGE_CHUNK_SIZE = 1000
+
+
+def _message_chunks(conversation_id):
+    """
+    Stream (sender, text, timestamp, tokens) tuples in timestamp order, in
+    lists of up to MESSAGE_CHUNK_SIZE, so long conversations are never fully
+    loaded.
+    """
+    rows = (
+        Message.objects.filter(conversation_id=conversation_id)
+        .order_by('timestamp')
+        .values_list('sender', 'text', 'timestamp', 'tokens')
+        .iterator(chunk_size=MESSAGE_CHUNK_SIZE)
+    )
+    while chunk := list(islice(rows, MESSAGE_CHUNK_SIZE)):
+        yield chunk
+
+
+def _save_analysis(conversation_id, fields):
+    """
+    Store analysis results, returning True if a new record was created.
+    
+    Re-analysis is the common case, so try a plain UPDATE first and only
+    INSERT when no row matched (one query instead of SELECT + UPDATE).
+    """
+    # QuerySet.update() bypasses auto_now, so stamp updated_at explicitly
+    fields = {**fields, 'updated_at': timezone.now()}
+    updated = ConversationAnalysis.objects.filter(
+        conversation_id=conversation_id
+    ).update(**fields)
+    if updated:
+        return False
+    
+    try:
+        with transaction.atomic():
+            ConversationAnalysis.objects.create(conversation_id=conversation_id, **fields)
+    except IntegrityError:
+        # Another worker created the record in the meantime
+        ConversationAnalysis.objects.filter(
+            conversation_id=conversation_id
+        ).update(**fields)
+        return False
+    return True
 
 
 @shared_task
@@ -13,41 +70,92 @@ def analyze_conversation_task(conversation_id):
         conversation_id: ID of the conversation to analyze
     """
     try:
-        conversation = Conversation.objects.get(id=conversation_id)
-        messages = conversation.messages.all().order_by('timestamp')
+        # Run analysis and hash the messages in the same pass
+        stream = get_analyzer().stream()
+        hasher = ContentHasher()
+        for chunk in _message_chunks(conversation_id):
+            stream.feed(chunk)
+            hasher.update(chunk)
         
-        if not messages.exists():
+        if not stream.message_count:
+            if not Conversation.objects.filter(id=conversation_id).exists():
+                return f"Conversation {conversation_id} not found"
             return f"Conversation {conversation_id} has no messages"
         
-        # Prepare messages for analyzer
-        messages_data = [
-            {
-                'sender': msg.sender,
-                'text': msg.text,
-                'timestamp': msg.timestamp
-            }
-            for msg in messages
-        ]
-        
-        # Run analysis
-        analyzer = ConversationAnalyzer()
-        analysis_results = analyzer.analyze(messages_data)
+        analysis_results = stream.finalize()
+        analysis_results['content_hash'] = hasher.hexdigest()
         
         # Create or update analysis record
-        analysis, created = ConversationAnalysis.objects.update_or_create(
-            conversation=conversation,
-            defaults=analysis_results
-        )
+        created = _save_analysis(conversation_id, analysis_results)
         
         action = "created" if created else "updated"
         return f"Analysis {action} for conversation {conversation_id}"
     
-    except Conversation.DoesNotExist:
-        return f"Conversation {conversation_id} not found"
     except Exception as e:
         return f"Error analyzing conversation {conversation_id}: {str(e)}"
 
 
+@shared_task
+def run_conversation_analysis(conversation_id):
+    """
+    Celery task behind POST /api/conversations/{id}/analyze/.
+    
+    Unlike analyze_conversation_task, the stored analysis is kept and cached
+    results are reused while the conversation's messages are unchanged.
+    
+    Errors are raised rather than returned, so a failed analysis shows up
+    as FAILURE in the task state reported by the analysis-status endpoint.
+    
+    Args:
+        conversation_id: ID of the conversation to analyze
+    """
+    # Hash the messages first; analysis is skipped if they are unchanged
+    hasher = ContentHasher()
+    message_count = 0
+    for chunk in _message_chunks(conversation_id):
+        hasher.update(chunk)
+        message_count += len(chunk)
+    
+    if not message_count:
+        return f"Conversation {conversation_id} has no messages"
+    
+    # Reuse the stored analysis if the messages have not changed
+    key = hasher.hexdigest()
+    if ConversationAnalysis.objects.filter(
+        conversation_id=conversation_id, content_hash=key
+    ).exists():
+        return f"Analysis unchanged for conversation {conversation_id}"
+    
+    # Identical transcripts (e.g. client retries) share cached results
+    analysis_results = cache.get(f'conv_analysis:{key}')
+    if analysis_results is None:
+        # Hash again while analyzing: messages written since the first pass
+        # must be covered by the hash stored with these results
+        stream = get_analyzer().stream()
+        hasher = ContentHasher()
+        for chunk in _message_chunks(conversation_id):
+            stream.feed(chunk)
+            hasher.update(chunk)
+        
+        if not stream.message_count:
+            return f"Conversation {conversation_id} has no messages"
+        
+        key = hasher.hexdigest()
+        analysis_results = stream.finalize()
+        cache.set(
+            f'conv_analysis:{key}', analysis_results,
+            timeout=ANALYSIS_CACHE_TIMEOUT
+        )
+    
+    # Create or update analysis record
+    created = _save_analysis(
+        conversation_id, {**analysis_results, 'content_hash': key}
+    )
+    
+    action = "created" if created else "updated"
+    return f"Analysis {action} for conversation {conversation_id}"
+
+
 @shared_task
 def analyze_unanalyzed_conversations():
     """
@@ -56,12 +164,15 @@ def analyze_unanalyzed_conversations():
     """
     # Find conversations without analysis
     unanalyzed = Conversation.objects.filter(
-        Q(analysis__isnull=True)
-    ).values_list('id', flat=True)
+        analysis__isnull=True
+    ).values_list('id', flat=True).iterator(chunk_size=ANALYSIS_BATCH_SIZE)
     
+    # Ids are read and sent in slices, never all at once. Each conversation
+    # is still its own task so workers analyze them in parallel; the group
+    # only sends a slice's messages over one broker connection.
     count = 0
-    for conversation_id in unanalyzed:
-        analyze_conversation_task.delay(conversation_id)
-        count += 1
+    while batch := list(islice(unanalyzed, ANALYSIS_BATCH_SIZE)):
+        group(analyze_conversation_task.s(cid) for cid in batch).apply_async()
+        count += len(batch)
     
     return f"Queued {count} conversations for analysis"
\ No newline at end of file
@@ -1,11 +1,19 @@
+import json
 import pytest
 from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 
+from config import celery_app
 from .models import Conversation, Message, ConversationAnalysis
 from .analysis import ConversationAnalyzer
+from .tasks import analyze_conversation_task, analyze_unanalyzed_conversations
 
 
 class ConversationAnalyzerTest(TestCase):
@@ -74,6 +82,24 @@ class ConversationAnalyzerTest(TestCase):
         result = self.analyzer.analyze(positive_messages)
         self.assertEqual(result['sentiment'], 'positive')
     
+    def test_neutral_sentiment_without_cues(self):
+        """Test messages without sentiment words are neutral"""
+        neutral_messages = [
+            {
+                'sender': 'user',
+                'text': 'Where is order 1234?',
+                'timestamp': datetime.now()
+            },
+            {
+                'sender': 'agent',
+                'text': 'It ships on Tuesday.',
+                'timestamp': datetime.now()
+            }
+        ]
+        
+        result = self.analyzer.analyze(neutral_messages)
+        self.assertEqual(result['sentiment'], 'neutral')
+    
     def test_resolution_detection(self):
         """Test resolution detection"""
         resolved_messages = [
@@ -110,6 +136,24 @@ class ConversationAnalyzerTest(TestCase):
         result = self.analyzer.analyze(escalation_messages)
         self.assertTrue(result['escalation_needed'])
     
+    def test_accuracy_score_for_emoji_reply(self):
+        """Test an agent reply without sentence text still gets the base accuracy"""
+        messages = [
+            {
+                'sender': 'user',
+                'text': 'Thanks for the refund',
+                'timestamp': datetime.now()
+            },
+            {
+                'sender': 'agent',
+                'text': '\U0001F44D',
+                'timestamp': datetime.now()
+            }
+        ]
+        
+        result = self.analyzer.analyze(messages)
+        self.assertEqual(result['accuracy_score'], 75.0)
+    
     def test_empathy_score(self):
         """Test empathy score calculation"""
         empathetic_messages = [
@@ -127,11 +171,59 @@ class ConversationAnalyzerTest(TestCase):
         
         result = self.analyzer.analyze(empathetic_messages)
         self.assertGreater(result['empathy_score'], 50)
+    
+    def test_empathy_wildcard_phrase_counted_once(self):
+        """Test a wildcard phrase spanning a repeated word is one hit"""
+        messages = [
+            {
+                'sender': 'agent',
+                'text': 'I want to understand. Do you understand the frustration?',
+                'timestamp': datetime.now()
+            },
+            {
+                'sender': 'user',
+                'text': 'Yes',
+                'timestamp': datetime.now()
+            }
+        ]
+        
+        result = self.analyzer.analyze(messages)
+        self.assertEqual(result['empathy_score'], 80.0)
+    
+    def test_streamed_analysis_matches_analyze(self):
+        """Test feeding messages in chunks gives the same metrics"""
+        start = datetime(2024, 1, 1, 10, 0, 0)
+        texts = [
+            ('user', 'My order never arrived, this is terrible'),
+            ('agent', 'I apologize. Let me check your order.'),
+            ('user', 'Can I speak to a human?'),
+            ('user', 'Where is my order?'),
+            ('agent', 'Your order shipped yesterday.'),
+            ('user', 'Thank you for your help!'),
+            ('agent', 'Glad that is resolved.'),
+        ]
+        messages = [
+            {'sender': sender, 'text': text, 'timestamp': start + timedelta(seconds=7 * i)}
+            for i, (sender, text) in enumerate(texts)
+        ]
+        
+        stream = self.analyzer.stream()
+        for i in range(0, len(messages), 2):
+            stream.feed(messages[i:i + 2])
+        
+        self.assertEqual(stream.finalize(), self.analyzer.analyze(messages))
 
 
 class ConversationAPITest(APITestCase):
     """Integration tests for the Conversation API"""
     
+    def setUp(self):
+        # Run Celery tasks inline so analysis results are visible to the test
+        # (settings are namespaced, so the CELERY_ key is the one to override)
+        eager = celery_app.conf.task_always_eager
+        celery_app.conf.update(CELERY_TASK_ALWAYS_EAGER=True)
+        self.addCleanup(celery_app.conf.update, CELERY_TASK_ALWAYS_EAGER=eager)
+    
     def test_create_conversation(self):
         """Test creating a conversation via API"""
         payload = {
@@ -155,6 +247,55 @@ class ConversationAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Conversation.objects.count(), 1)
         self.assertEqual(Message.objects.count(), 2)
+        self.assertEqual(
+            Message.objects.get(sender='agent').tokens,
+            ['hi', 'how', 'can', 'i', 'help']
+        )
+    
+    def test_message_tokens_updated_on_save(self):
+        """Test saving a message refreshes its stored tokens"""
+        conversation = Conversation.objects.create(title='Test')
+        message = Message.objects.create(
+            conversation=conversation,
+            sender='user',
+            text='Where is my order?',
+            timestamp=datetime.now()
+        )
+        self.assertEqual(message.tokens, ['where', 'is', 'my', 'order'])
+        
+        message.text = 'Never mind'
+        message.save()
+        message.refresh_from_db()
+        self.assertEqual(message.tokens, ['never', 'mind'])
+        
+        message.text = 'Found it, thanks'
+        message.save(update_fields=['text'])
+        message.refresh_from_db()
+        self.assertEqual(message.tokens, ['found', 'it', 'thanks'])
+    
+    def test_create_conversation_query_count(self):
+        """Test message inserts are batched regardless of message count"""
+        def payload(message_count):
+            return {
+                'title': 'Batch',
+                'messages': [
+                    {
+                        'sender': 'user' if i % 2 == 0 else 'agent',
+                        'text': f'Message {i}',
+                        'timestamp': f'2024-01-01T10:00:{i:02d}Z'
+                    }
+                    for i in range(message_count)
+                ]
+            }
+        
+        with CaptureQueriesContext(connection) as small:
+            self.client.post('/api/conversations/', payload(2), format='json')
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post('/api/conversations/', payload(50), format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['messages']), 50)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
     
     def test_list_conversations(self):
         """Test listing conversations"""
@@ -171,6 +312,21 @@ class ConversationAPITest(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['message_count'], 1)
+        self.assertNotIn('messages', response.data['results'][0])
+        
+        # Newest conversations are listed first
+        older = Conversation.objects.create(
+            title='Older', created_at=conversation.created_at - timedelta(days=1)
+        )
+        newer = Conversation.objects.create(
+            title='Newer', created_at=conversation.created_at + timedelta(days=1)
+        )
+        response = self.client.get('/api/conversations/')
+        self.assertEqual(
+            [c['id'] for c in response.data['results']],
+            [newer.id, conversation.id, older.id]
+        )
     
     def test_analyze_conversation(self):
         """Test analyzing a conversation via API"""
@@ -191,9 +347,159 @@ class ConversationAPITest(APITestCase):
         
         response = self.client.post(f'/api/conversations/{conversation.id}/analyze/')
         
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('overall_score', response.data)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIn('task_id', response.data)
         self.assertTrue(ConversationAnalysis.objects.filter(conversation=conversation).exists())
+        
+        # Eager results are not stored, so the result backend is never asked
+        with mock.patch('conversations.views.AsyncResult') as async_result:
+            response = self.client.get(response.data['status_url'])
+        
+        async_result.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'SUCCESS')
+        self.assertIn('overall_score', response.data['analysis'])
+    
+    def test_analysis_status_with_worker(self):
+        """Test the status endpoint reports the Celery task state"""
+        conversation = Conversation.objects.create(title='Test')
+        url = f'/api/conversations/{conversation.id}/analysis-status/?task_id=abc'
+        celery_app.conf.update(CELERY_TASK_ALWAYS_EAGER=False)
+        
+        with mock.patch('conversations.views.AsyncResult') as async_result:
+            result = async_result.return_value
+            
+            result.status = 'PENDING'
+            result.ready.return_value = False
+            response = self.client.get(url)
+            self.assertEqual(response.data['status'], 'PENDING')
+            self.assertNotIn('analysis', response.data)
+            
+            result.status = 'FAILURE'
+            result.ready.return_value = True
+            result.failed.return_value = True
+            result.result = ValueError('boom')
+            response = self.client.get(url)
+            self.assertEqual(response.data['status'], 'FAILURE')
+            self.assertEqual(response.data['error'], 'boom')
+            
+            result.status = 'SUCCESS'
+            result.failed.return_value = False
+            result.result = f'Conversation {conversation.id} has no messages'
+            response = self.client.get(url)
+            self.assertEqual(response.data['status'], 'NOT_ANALYZED')
+            self.assertEqual(response.data['detail'], result.result)
+        
+        async_result.assert_called_with('abc')
+    
+    def test_analyze_empty_conversation(self):
+        """Test a conversation without messages is queued but not analyzed"""
+        conversation = Conversation.objects.create(title='Empty')
+        
+        response = self.client.post(f'/api/conversations/{conversation.id}/analyze/')
+        
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(ConversationAnalysis.objects.filter(conversation=conversation).exists())
+        response = self.client.get(f'/api/conversations/{conversation.id}/analysis-status/')
+        self.assertEqual(response.data['status'], 'NOT_ANALYZED')
+    
+    def test_analyze_conversation_failure(self):
+        """Test analysis errors are reported instead of success"""
+        conversation = Conversation.objects.create(title='Test')
+        Message.objects.create(
+            conversation=conversation,
+            sender='user',
+            text='I need help',
+            timestamp=datetime.now()
+        )
+        
+        with mock.patch('conversations.tasks.get_analyzer', side_effect=RuntimeError('boom')):
+            response = self.client.post(f'/api/conversations/{conversation.id}/analyze/')
+        
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.data['status'], 'FAILURE')
+        self.assertFalse(ConversationAnalysis.objects.filter(conversation=conversation).exists())
+    
+    def test_reanalyze_unchanged_conversation(self):
+        """Test re-analyzing unchanged messages reuses the stored analysis"""
+        conversation = Conversation.objects.create(title='Test')
+        Message.objects.create(
+            conversation=conversation,
+            sender='user',
+            text='Where is my order?',
+            timestamp=datetime.now()
+        )
+        Message.objects.create(
+            conversation=conversation,
+            sender='agent',
+            text='It has shipped.',
+            timestamp=datetime.now() + timedelta(seconds=5)
+        )
+        
+        url = f'/api/conversations/{conversation.id}/analyze/'
+        self.client.post(url)
+        analysis = ConversationAnalysis.objects.get(conversation=conversation)
+        with mock.patch('conversations.tasks.get_analyzer') as get_analyzer:
+            response = self.client.post(url)
+        
+        get_analyzer.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            ConversationAnalysis.objects.get(conversation=conversation).id,
+            analysis.id
+        )
+    
+    def test_analyze_identical_transcript_uses_cache(self):
+        """Test a transcript analyzed before is not analyzed again"""
+        timestamp = datetime(2024, 3, 1, 9, 30, 0)
+        conversations = []
+        for title in ('First', 'Retry'):
+            conversation = Conversation.objects.create(title=title)
+            Message.objects.create(
+                conversation=conversation,
+                sender='user',
+                text='My parcel 9931 is missing',
+                timestamp=timestamp
+            )
+            conversations.append(conversation)
+        
+        self.client.post(f'/api/conversations/{conversations[0].id}/analyze/')
+        with mock.patch('conversations.tasks.get_analyzer') as get_analyzer:
+            response = self.client.post(f'/api/conversations/{conversations[1].id}/analyze/')
+        
+        get_analyzer.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        first, retry = (
+            ConversationAnalysis.objects.get(conversation=conversation)
+            for conversation in conversations
+        )
+        self.assertEqual(retry.content_hash, first.content_hash)
+        self.assertEqual(retry.overall_score, first.overall_score)
+    
+    def test_reanalyze_changed_conversation(self):
+        """Test re-analyzing after new messages updates the stored analysis"""
+        conversation = Conversation.objects.create(title='Test')
+        Message.objects.create(
+            conversation=conversation,
+            sender='user',
+            text='Where is my order?',
+            timestamp=datetime.now()
+        )
+        
+        self.assertIn('created', analyze_conversation_task(conversation.id))
+        analysis = ConversationAnalysis.objects.get(conversation=conversation)
+        
+        Message.objects.create(
+            conversation=conversation,
+            sender='agent',
+            text='It has shipped.',
+            timestamp=datetime.now() + timedelta(seconds=5)
+        )
+        
+        self.assertIn('updated', analyze_conversation_task(conversation.id))
+        updated = ConversationAnalysis.objects.get(conversation=conversation)
+        self.assertEqual(updated.id, analysis.id)
+        self.assertNotEqual(updated.content_hash, analysis.content_hash)
     
     def test_list_analyses(self):
         """Test listing analyses with filters"""
@@ -223,4 +529,136 @@ class ConversationAPITest(APITestCase):
         
         # Test filtering by sentiment
         response = self.client.get('/api/analysis/?sentiment=positive')
-        self.assertEqual(len(response.data['results']), 1)
\ No newline at end of file
+        self.assertEqual(len(response.data['results']), 1)
+        
+        # Test filtering by minimum score
+        response = self.client.get('/api/analysis/?min_score=90')
+        self.assertEqual(len(response.data['results']), 0)
+        
+        # Invalid filter values are rejected rather than ignored
+        response = self.client.get('/api/analysis/?min_score=high')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_retrieve_analysis_etag(self):
+        """Test unchanged analyses are answered with 304 Not Modified"""
+        conversation = Conversation.objects.create(title='Test')
+        Message.objects.create(
+            conversation=conversation,
+            sender='user',
+            text='Help',
+            timestamp=datetime.now()
+        )
+        analyze_conversation_task(conversation.id)
+        analysis = ConversationAnalysis.objects.get(conversation=conversation)
+        url = f'/api/analysis/{analysis.id}/'
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        # Re-analysis changes the ETag
+        Message.objects.create(
+            conversation=conversation,
+            sender='agent',
+            text='Sure',
+            timestamp=datetime.now()
+        )
+        analyze_conversation_task(conversation.id)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_list_analyses_gzip(self):
+        """Test list responses are compressed for clients that accept gzip"""
+        for i in range(20):
+            conversation = Conversation.objects.create(title=f'Test {i}')
+            ConversationAnalysis.objects.create(
+                conversation=conversation,
+                sentiment='neutral',
+                overall_score=70.0
+            )
+        
+        response = self.client.get('/api/analysis/', HTTP_ACCEPT_ENCODING='gzip')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+class AnalyzeUnanalyzedConversationsTest(TestCase):
+    """Tests for the daily analyze_unanalyzed_conversations task"""
+    
+    def test_queues_one_task_per_conversation(self):
+        """Test each unanalyzed conversation is queued as its own task"""
+        ids = [Conversation.objects.create(title=f'Test {i}').id for i in range(3)]
+        analyzed = Conversation.objects.create(title='Analyzed')
+        ConversationAnalysis.objects.create(conversation=analyzed)
+        
+        with mock.patch('conversations.tasks.ANALYSIS_BATCH_SIZE', 2), \
+                mock.patch('conversations.tasks.group') as group:
+            result = analyze_unanalyzed_conversations()
+        
+        self.assertEqual(result, 'Queued 3 conversations for analysis')
+        batches = [list(call.args[0]) for call in group.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(group.return_value.apply_async.call_count, 2)
+        queued = sorted(sig.args[0] for batch in batches for sig in batch)
+        self.assertEqual(queued, ids)
+
+
+class AnalyzeAllCommandTest(TestCase):
+    """Tests for the analyze_all management command"""
+    
+    def test_analyze_all(self):
+        """Test every conversation with messages gets analyzed"""
+        for i in range(3):
+            conversation = Conversation.objects.create(title=f'Test {i}')
+            Message.objects.create(
+                conversation=conversation,
+                sender='user',
+                text='Where is my order?',
+                timestamp=datetime.now()
+            )
+        Conversation.objects.create(title='Empty')
+        
+        out = StringIO()
+        call_command('analyze_all', workers=1, stdout=out, stderr=StringIO())
+        
+        self.assertEqual(ConversationAnalysis.objects.count(), 3)
+        self.assertIn('Analyzed 3 conversations', out.getvalue())
+
+
+class ORJSONRendererTest(APITestCase):
+    """Tests for the orjson renderer and parser"""
+    
+    def test_json_round_trip(self):
+        """Test conversations are parsed and rendered as JSON"""
+        payload = {
+            'title': 'Test',
+            'messages': [
+                {'sender': 'user', 'text': 'Hello', 'timestamp': '2024-01-01T10:00:00Z'}
+            ]
+        }
+        
+        response = self.client.post(
+            '/api/conversations/', json.dumps(payload), content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content)['title'], 'Test')
+    
+    def test_malformed_json(self):
+        """Test malformed request bodies are rejected with 400"""
+        response = self.client.post(
+            '/api/conversations/', '{"title": ', content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_browsable_api(self):
+        """Test the browsable API still renders"""
+        response = self.client.get('/api/analysis/', HTTP_ACCEPT='text/html')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
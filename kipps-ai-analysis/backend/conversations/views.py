@@ -1,16 +1,30 @@
+from celery.result import AsyncResult
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from django.db.models import Count, Prefetch
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Conversation, Message, ConversationAnalysis
 from .serializers import (
     ConversationSerializer,
+    ConversationListSerializer,
     ConversationCreateSerializer,
     ConversationAnalysisSerializer,
     MessageSerializer
 )
-from .analysis import ConversationAnalyzer
+from .filters import AnalysisFilter
+from .pagination import AnalysisCursorPagination
+from .tasks import run_conversation_analysis
+
+
+def _tasks_run_eagerly():
+    """Whether Celery runs tasks inline (CELERY_TASK_ALWAYS_EAGER)."""
+    return run_conversation_analysis.app.conf.task_always_eager
 
 
 class ConversationViewSet(viewsets.ModelViewSet):
@@ -21,11 +35,37 @@ class ConversationViewSet(viewsets.ModelViewSet):
     - GET /api/conversations/ - List all conversations
     - POST /api/conversations/ - Create a new conversation with messages
     - GET /api/conversations/{id}/ - Get conversation details
-    - POST /api/conversations/{id}/analyze/ - Analyze specific conversation
+    - POST /api/conversations/{id}/analyze/ - Queue analysis of a conversation
+    - GET /api/conversations/{id}/analysis-status/ - Check queued analysis
     """
-    queryset = Conversation.objects.all().prefetch_related('messages')
+    queryset = Conversation.objects.only('id', 'title', 'created_at').prefetch_related(
+        Prefetch(
+            'messages',
+            queryset=Message.objects.only(
+                'id', 'conversation_id', 'sender', 'text', 'timestamp'
+            ).order_by('timestamp')
+        )
+    )
     serializer_class = ConversationSerializer
     
+    def get_queryset(self):
+        """List views only need message counts, not the messages themselves."""
+        if self.action == 'list':
+            # annotate() with an aggregate drops Meta.ordering, so order
+            # explicitly (newest first, id breaking ties for stable pages)
+            return Conversation.objects.only(
+                'id', 'title', 'created_at'
+            ).select_related('analysis').annotate(
+                message_count=Count('messages')
+            ).order_by('-created_at', '-id')
+        return super().get_queryset()
+    
+    def get_serializer_class(self):
+        """Use the summary serializer for list views."""
+        if self.action == 'list':
+            return ConversationListSerializer
+        return super().get_serializer_class()
+    
     def create(self, request, *args, **kwargs):
         """Create a conversation with messages from JSON payload."""
         serializer = ConversationCreateSerializer(data=request.data)
@@ -39,43 +79,94 @@ class ConversationViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def analyze(self, request, pk=None):
         """
-        Trigger analysis for a specific conversation.
+        Queue analysis for a specific conversation on a Celery worker.
         
         POST /api/conversations/{id}/analyze/
+        
+        Returns 202 with the task id and the URL to poll for the result.
         """
-        conversation = self.get_object()
+        # Only the id is needed; the viewset queryset would prefetch messages
+        conversation = get_object_or_404(Conversation.objects.only('id'), pk=pk)
         
-        # Get all messages for this conversation
-        messages = conversation.messages.all().order_by('timestamp')
+        # A conversation without messages is reported by the task itself
+        # rather than checked here with an extra query
+        task = run_conversation_analysis.delay(conversation.id)
         
-        if not messages.exists():
+        # Eager tasks have already run, and their results are not stored
+        # anywhere the status endpoint could read them; report failures now
+        if _tasks_run_eagerly() and task.failed():
             return Response(
-                {'error': 'Cannot analyze conversation with no messages'},
-                status=status.HTTP_400_BAD_REQUEST
+                {'task_id': task.id, 'status': task.status, 'error': str(task.result)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        # Prepare messages for analyzer
-        messages_data = [
-            {
-                'sender': msg.sender,
-                'text': msg.text,
-                'timestamp': msg.timestamp
-            }
-            for msg in messages
-        ]
+        status_url = reverse(
+            'conversation-analysis-status', args=[conversation.id], request=request
+        )
+        return Response(
+            {'task_id': task.id, 'status_url': f'{status_url}?task_id={task.id}'},
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @action(detail=True, methods=['get'], url_path='analysis-status')
+    def analysis_status(self, request, pk=None):
+        """
+        Report the state of a queued analysis.
         
-        # Run analysis
-        analyzer = ConversationAnalyzer()
-        analysis_results = analyzer.analyze(messages_data)
+        GET /api/conversations/{id}/analysis-status/?task_id=<task_id>
         
-        # Create or update analysis record
-        analysis, created = ConversationAnalysis.objects.update_or_create(
-            conversation=conversation,
-            defaults=analysis_results
-        )
+        While the task is running only its Celery state is returned, and a
+        failed task reports its error. Once it has succeeded (or without a
+        task_id) the stored analysis is included; if there is none, the
+        status is NOT_ANALYZED and the task's message (e.g. that the
+        conversation has no messages) is given as the detail.
         
-        serializer = ConversationAnalysisSerializer(analysis)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        With CELERY_TASK_ALWAYS_EAGER the task ran inside the analyze request
+        and has no stored result, so only the stored analysis is reported.
+        """
+        conversation = get_object_or_404(Conversation.objects.only('id'), pk=pk)
+        task_id = request.query_params.get('task_id')
+        task_status = 'SUCCESS'
+        task_message = None
+        
+        if task_id and not _tasks_run_eagerly():
+            result = AsyncResult(task_id)
+            task_status = result.status
+            if not result.ready():
+                return Response({'task_id': task_id, 'status': task_status})
+            if result.failed():
+                return Response({
+                    'task_id': task_id,
+                    'status': task_status,
+                    'error': str(result.result),
+                })
+            task_message = result.result
+        
+        analysis = ConversationAnalysis.objects.filter(
+            conversation=conversation
+        ).first()
+        
+        if analysis is None:
+            data = {'task_id': task_id, 'status': 'NOT_ANALYZED'}
+            if task_message:
+                data['detail'] = task_message
+            return Response(data)
+        
+        return Response({
+            'task_id': task_id,
+            'status': task_status,
+            'analysis': ConversationAnalysisSerializer(analysis).data,
+        })
+
+
+def _analysis_etag(request, pk=None, **kwargs):
+    """ETag for an analysis, or None (no conditional handling) if missing."""
+    updated_at = ConversationAnalysis.objects.filter(pk=pk).values_list(
+        'updated_at', flat=True
+    ).first()
+    if updated_at is None:
+        return None
+    return f'{pk}-{updated_at.timestamp()}'
 
 
 class AnalysisViewSet(viewsets.ReadOnlyModelViewSet):
@@ -88,30 +179,16 @@ class AnalysisViewSet(viewsets.ReadOnlyModelViewSet):
     """
     queryset = ConversationAnalysis.objects.all().select_related('conversation')
     serializer_class = ConversationAnalysisSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = AnalysisFilter
+    pagination_class = AnalysisCursorPagination
     
-    def get_queryset(self):
-        """Filter by sentiment, date, or score if provided."""
-        queryset = super().get_queryset()
-        
-        # Filter by sentiment
-        sentiment = self.request.query_params.get('sentiment', None)
-        if sentiment:
-            queryset = queryset.filter(sentiment=sentiment)
-        
-        # Filter by date range
-        date_from = self.request.query_params.get('date_from', None)
-        date_to = self.request.query_params.get('date_to', None)
-        if date_from:
-            queryset = queryset.filter(created_at__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(created_at__lte=date_to)
-        
-        # Filter by minimum overall score
-        min_score = self.request.query_params.get('min_score', None)
-        if min_score:
-            try:
-                queryset = queryset.filter(overall_score__gte=float(min_score))
-            except ValueError:
-                pass
+    @method_decorator(condition(etag_func=_analysis_etag))
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Get a specific analysis.
         
-        return queryset
\ No newline at end of file
+        Responses carry an ETag derived from the analysis' updated_at, so
+        clients polling with If-None-Match get 304 until it is re-analyzed.
+        """
+        return super().retrieve(request, *args, **kwargs)
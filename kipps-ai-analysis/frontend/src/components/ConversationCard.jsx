@@ -3,7 +3,7 @@ import { Link } from 'react-router-dom'
 import ScoreBadge from './ScoreBadge'
 
 const ConversationCard = ({ conversation }) => {
-  const { id, title, created_at, messages, analysis, has_analysis } = conversation
+  const { id, title, created_at, message_count, analysis, has_analysis } = conversation
 
   const formatDate = (dateString) => {
     const date = new Date(dateString)
@@ -28,7 +28,7 @@ const ConversationCard = ({ conversation }) => {
               {formatDate(created_at)}
             </p>
             <p className="text-sm text-gray-600 mt-2">
-              {messages?.length || 0} messages
+              {message_count || 0} messages
             </p>
           </div>
 
@@ -35,10 +35,33 @@ const ConversationDetail = () => {
     }
   }
 
+  const waitForAnalysis = async (taskId) => {
+    // Analysis runs in a Celery worker; poll until the task has finished,
+    // giving up after a minute
+    const pending = ['PENDING', 'STARTED', 'RETRY']
+    for (let attempt = 0; attempt < 60; attempt++) {
+      const response = await axios.get(`/conversations/${id}/analysis-status/`, {
+        params: { task_id: taskId },
+      })
+      if (response.data.status === 'FAILURE') {
+        throw new Error(response.data.error || 'Analysis failed')
+      }
+      if (response.data.status === 'NOT_ANALYZED') {
+        throw new Error(response.data.detail || 'Conversation was not analyzed')
+      }
+      if (!pending.includes(response.data.status)) {
+        return response.data
+      }
+      await new Promise((resolve) => setTimeout(resolve, 1000))
+    }
+    throw new Error('Timed out waiting for analysis')
+  }
+
   const handleAnalyze = async () => {
     try {
       setAnalyzing(true)
-      await axios.post(`/conversations/${id}/analyze/`)
+      const response = await axios.post(`/conversations/${id}/analyze/`)
+      await waitForAnalysis(response.data.task_id)
       await fetchConversation()
     } catch (err) {
       setError('Failed to analyze conversation')
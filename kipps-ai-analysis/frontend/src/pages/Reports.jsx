@@ -9,23 +9,29 @@ const Reports = () => {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [filters, setFilters] = useState({})
-  const [page, setPage] = useState(1)
-  const [totalPages, setTotalPages] = useState(1)
+  const [cursor, setCursor] = useState(null)
+  const [pageLinks, setPageLinks] = useState({ next: null, previous: null })
 
   useEffect(() => {
     fetchAnalyses()
-  }, [filters, page])
+  }, [filters, cursor])
+
+  // The API paginates by cursor; pull it out of the next/previous links
+  const cursorFrom = (url) => (url ? new URL(url).searchParams.get('cursor') : null)
 
   const fetchAnalyses = async () => {
     try {
       setLoading(true)
-      const params = new URLSearchParams({
-        page: page.toString(),
-        ...filters,
-      })
+      const params = new URLSearchParams(filters)
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
       const response = await axios.get(`/analysis/?${params}`)
       setAnalyses(response.data.results)
-      setTotalPages(Math.ceil(response.data.count / 10))
+      setPageLinks({
+        next: cursorFrom(response.data.next),
+        previous: cursorFrom(response.data.previous),
+      })
       setError(null)
     } catch (err) {
       setError('Failed to load analyses')
@@ -40,12 +46,12 @@ const Reports = () => {
       ...prev,
       [key]: value,
     }))
-    setPage(1)
+    setCursor(null)
   }
 
   const handleResetFilters = () => {
     setFilters({})
-    setPage(1)
+    setCursor(null)
   }
 
   const formatDate = (dateString) => {
@@ -203,22 +209,19 @@ const Reports = () => {
               </div>
 
               {/* Pagination */}
-              {totalPages > 1 && (
+              {(pageLinks.next || pageLinks.previous) && (
                 <div className="flex justify-center items-center gap-2 mt-6">
                   <button
                     className="btn-secondary"
-                    onClick={() => setPage(page - 1)}
-                    disabled={page === 1}
+                    onClick={() => setCursor(pageLinks.previous)}
+                    disabled={!pageLinks.previous}
                   >
                     Previous
                   </button>
-                  <span className="text-sm text-gray-600">
-                    Page {page} of {totalPages}
-                  </span>
                   <button
                     className="btn-secondary"
-                    onClick={() => setPage(page + 1)}
-                    disabled={page === totalPages}
+                    onClick={() => setCursor(pageLinks.next)}
+                    disabled={!pageLinks.next}
                   >
                     Next
                   </button>